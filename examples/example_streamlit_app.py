@@ -1,12 +1,43 @@
+import io
+
+import pandas as pd
 import streamlit as st  # pip install streamlit
 from fastaframes import to_df
 
+
+# streamlit reruns the whole script on every widget interaction, so cache the work keyed on the uploaded bytes
+@st.cache_data(show_spinner='Parsing FASTA...')
+def parse_fasta(file_bytes: bytes) -> pd.DataFrame:
+    return to_df(io.BytesIO(file_bytes))
+
+
+@st.cache_data
+def to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, engine='pyarrow', compression='zstd', index=False)  # pip install pyarrow
+    return buffer.getvalue()
+
+
+@st.cache_data
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode('utf-8')
+
+
 fasta = st.file_uploader('Upload FASTA file', type='.fasta')
 
 if fasta:
-    df = to_df(fasta)
+    df = parse_fasta(fasta.getvalue())
 
     # display the dataframe
     st.dataframe(df)
 
+    # parquet is much faster to write and far smaller than csv
+    file_format = st.radio('Download format', ['parquet', 'csv'], horizontal=True)
+
+    if file_format == 'parquet':
+        st.download_button('Download', data=to_parquet_bytes(df), file_name=f'{fasta.name}.parquet',
+                           mime='application/vnd.apache.parquet')
+    else:
+        st.download_button('Download', data=to_csv_bytes(df), file_name=f'{fasta.name}.csv', mime='text/csv')
+
     st.balloons()  # 🎈
@@ -1,4 +1,5 @@
 """specifies filterframes version"""
-from .fastaframes import FastaEntry, to_df, to_fasta, fasta_to_entries, df_to_entries, entries_to_fasta, entries_to_df
+from .fastaframes import FastaEntry, to_df, to_fasta, fasta_to_entries, df_to_entries, entries_to_fasta, \
+    entries_to_df, fasta_to_columns, to_df_chunks
 
 __version__ = '1.1.0'
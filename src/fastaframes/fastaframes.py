@@ -2,18 +2,27 @@
 This module implements the core functions of filterframes.
 """
 
-from dataclasses import dataclass, asdict
+import os
+import re
+import sys
+from dataclasses import dataclass
 from io import TextIOWrapper, StringIO
-from typing import Union, TextIO, List, Dict, Tuple, Generator, Iterable
+from typing import Union, TextIO, List, Dict, Tuple, Generator, Iterable, Callable
 from enum import Enum
+from functools import lru_cache
+from itertools import chain, islice
+from operator import attrgetter
 
+import numpy as np
 import pandas as pd
 
-from fastaframes.util import get_lines, convert_to_best_datatype
+from fastaframes.util import get_blocks, convert_to_best_datatype
 
 COLS = ['db', 'unique_identifier', 'entry_name', 'protein_name', 'organism_name', 'organism_identifier',
         'gene_name', 'protein_existence', 'sequence_version', 'protein_sequence']
 
+_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+
 
 class FastaFields(Enum):
     """
@@ -35,7 +44,37 @@ class FastaFields(Enum):
     SEQUENCE_VERSION = 'SV'
 
 
-@dataclass
+_VALID_FIELDS = frozenset(field.value for field in FastaFields)
+
+# the optional header fields, in the order they are written, paired with the ' XX=' prefix written before them
+_OPTIONAL_KEYS = (
+    ('protein_name', f' {FastaFields.PROTEIN_NAME.value}='),
+    ('organism_name', f' {FastaFields.ORGANISM_NAME.value}='),
+    ('organism_identifier', f' {FastaFields.ORGANISM_ID.value}='),
+    ('gene_name', f' {FastaFields.GENE_NAME.value}='),
+    ('protein_existence', f' {FastaFields.PROTEIN_EXISTENCE.value}='),
+    ('sequence_version', f' {FastaFields.SEQUENCE_VERSION.value}='),
+)
+
+# columns that hold integers in well formed UniProt headers, stored as int32 (with nulls) by the pyarrow backend
+_INTEGER_COLS = frozenset(['organism_identifier', 'protein_existence', 'sequence_version'])
+
+# columns with only a handful of distinct values (e.g. sp/tr), stored dictionary encoded by the pyarrow backend
+_CATEGORICAL_COLS = frozenset(['db', 'organism_name'])
+
+# matches the key of any space separated token containing '=', so that malformed keys are rejected rather than
+# merged into the previous value
+_FIELD_KEY_PATTERN = re.compile(r'(?:^| )([^ =]*)=')
+
+# the ' XX=' markers of the fields that follow the ProteinName in a header description
+_DESCRIPTION_MARKERS = tuple((field.value, f' {field.value}=') for field in FastaFields
+                             if field is not FastaFields.PROTEIN_NAME)
+
+# slots drop the per-instance __dict__, but dataclass only supports them from python 3.10
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class FastaEntry:
     """
     A dataclass representing a FASTA entry.
@@ -81,23 +120,151 @@ class FastaEntry:
         :rtype: str
         """
 
-        optional_fields = [
-            (f' {FastaFields.PROTEIN_NAME.value}=', self.protein_name),
-            (f' {FastaFields.ORGANISM_NAME.value}=', self.organism_name),
-            (f' {FastaFields.ORGANISM_ID.value}=', self.organism_identifier),
-            (f' {FastaFields.GENE_NAME.value}=', self.gene_name),
-            (f' {FastaFields.PROTEIN_EXISTENCE.value}=', self.protein_existence),
-            (f' {FastaFields.SEQUENCE_VERSION.value}=', self.sequence_version)
-        ]
+        # unrolled rather than looping over _OPTIONAL_KEYS, this runs once per entry when writing whole files
+        protein_name = self.protein_name
+        organism_name = self.organism_name
+        organism_identifier = self.organism_identifier
+        gene_name = self.gene_name
+        protein_existence = self.protein_existence
+        sequence_version = self.sequence_version
+
+        return ''.join((
+            f'>{self.db}|{self.unique_identifier}|{self.entry_name}',
+            f' PN={protein_name}' if protein_name else '',
+            f' OS={organism_name}' if organism_name else '',
+            f' OX={organism_identifier}' if organism_identifier else '',
+            f' GN={gene_name}' if gene_name else '',
+            f' PE={protein_existence}' if protein_existence else '',
+            f' SV={sequence_version}' if sequence_version else '',
+            f'\n{self.protein_sequence}\n',
+        ))
+
+
+def _split_blocks(blocks: Iterable[str]) -> Generator[str, None, None]:
+    """
+    Splits blocks of FASTA text on every '\\n>' with a bulk str.split, stitching together records that span blocks.
+
+    :param blocks: Consecutive blocks of FASTA text, as returned by get_blocks.
+    :type blocks: Iterable[str]
+    :return: A generator that yields the text between consecutive headers.
+    :rtype: Generator[str, None, None]
+    """
+
+    pending = []  # pieces of the record that continues into the next block
+
+    for block in blocks:
+        pieces = block.split('\n>')
+
+        if pending and pending[-1].endswith('\n') and pieces[0].startswith('>'):
+            # the previous block ended on the newline right before this header
+            pieces[0] = pieces[0][1:]
+            pieces.insert(0, '')
+
+        pending.append(pieces[0])
+        if len(pieces) > 1:
+            yield ''.join(pending)
+            yield from pieces[1:-1]
+            pending = [pieces[-1]]
+
+    if pending:
+        yield ''.join(pending)
+
+
+def _split_indented_headers(record: str) -> List[str]:
+    """
+    Splits a raw record on the header lines that start with whitespace before their '>', which the '\\n>' split in
+    _split_blocks does not see.
+
+    :param record: Text following a '>', i.e. a header line and its sequence lines.
+    :type record: str
+    :return: The leading part of the record, followed by one record (without its leading '>') per indented header.
+    :rtype: List[str]
+    """
+
+    pieces = []
+    lines = []
 
-        fasta_header = f'>{self.db}|{self.unique_identifier}|{self.entry_name}'
-        fasta_header += ''.join(f"{key}{value}" for key, value in optional_fields if value)
+    for line in record.split('\n'):
+        stripped = line.lstrip()
+        if stripped.startswith('>') and lines:
+            pieces.append('\n'.join(lines))
+            lines = [stripped[1:]]
+        else:
+            lines.append(line)
 
-        return f"{fasta_header}\n{self.protein_sequence}\n"
+    pieces.append('\n'.join(lines))
 
+    return pieces
 
-def fasta_to_entries(data: Union[str, TextIOWrapper, StringIO, TextIO], skip_error: bool = False) -> \
-        Generator[FastaEntry, None, None]:
+
+def _split_records(blocks: Iterable[str]) -> Generator[str, None, None]:
+    """
+    Splits blocks of FASTA text into raw records.
+
+    Each yielded record is the header line without its leading '>', followed by the (still newline separated)
+    sequence lines. Any text before the first header is dropped. Header lines may be indented.
+
+    :param blocks: Consecutive blocks of FASTA text, as returned by get_blocks.
+    :type blocks: Iterable[str]
+    :return: A generator that yields one raw record string per FASTA entry.
+    :rtype: Generator[str, None, None]
+    """
+
+    records = _split_blocks(blocks)
+
+    first_record = next(records, '').lstrip()
+    if first_record.startswith('>'):
+        records = chain([first_record[1:]], records)
+    elif '>' in first_record:
+        # text before an indented first header
+        records = chain(_split_indented_headers(first_record)[1:], records)
+
+    for record in records:
+        # '>' is not part of a sequence, so only records holding one after the header line are split line by line
+        if record.find('>', record.find('\n') + 1 or len(record)) == -1:
+            yield record
+        else:
+            yield from _split_indented_headers(record)
+
+
+def _fasta_to_records(data: Union[str, TextIOWrapper, StringIO, TextIO], skip_error: bool = False,
+                      headers_only: bool = False) -> Generator[Tuple[str, ...], None, None]:
+    """
+    Parses FASTA content into plain tuples, one per entry, ordered like the FastaEntry fields.
+
+    :param data: FASTA content or a file-like object containing FASTA content.
+    :type data: Union[str, TextIOWrapper, StringIO, TextIO]
+    :param skip_error: If True, skips invalid FASTA entries instead of raising an error.
+    :type skip_error: bool
+    :param headers_only: If True, the sequences are never assembled and the tuples stop before protein_sequence.
+    :type headers_only: bool
+
+    :return: A generator that yields one tuple of field values per FASTA entry.
+    :rtype: Generator[Tuple[str, ...], None, None]
+    """
+
+    for record in _split_records(get_blocks(data)):
+        header_end = record.find('\n')
+        if header_end == -1:
+            header_end = len(record)
+        header = record[:header_end]
+
+        try:
+            header_values = _parse_fasta_header(header)
+        except ValueError as e:
+            if skip_error:
+                continue
+            raise e
+
+        if headers_only:
+            yield header_values
+        else:
+            # drops the newlines (and any other whitespace) between the sequence lines
+            yield header_values + (''.join(record[header_end + 1:].split()),)
+
+
+def fasta_to_entries(data: Union[str, TextIOWrapper, StringIO, TextIO], skip_error: bool = False,
+                     headers_only: bool = False) -> Generator[FastaEntry, None, None]:
     """
     Converts FASTA content to a list of FastaEntry objects.
 
@@ -105,61 +272,219 @@ def fasta_to_entries(data: Union[str, TextIOWrapper, StringIO, TextIO], skip_err
     :type data: Union[str, TextIOWrapper, StringIO, TextIO]
     :param skip_error: If True, skips invalid FASTA entries instead of raising an error.
     :type skip_error: bool
+    :param headers_only: If True, the sequences are skipped and every protein_sequence is left empty.
+    :type headers_only: bool
 
     :return: A generator that yields FastaEntry objects.
     :rtype: Generator[FastaEntry, None, None]
     """
 
-    # Ensure data is iterable line by line
-    lines = get_lines(data)
+    for record in _fasta_to_records(data, skip_error, headers_only):
+        yield FastaEntry(*record)
 
-    current_entry = None
 
-    for line in lines:
-        line = line.strip()
+def fasta_to_columns(data: Union[str, TextIOWrapper, StringIO, TextIO], skip_error: bool = False,
+                     headers_only: bool = False) -> Dict[str, List[str]]:
+    """
+    Converts FASTA content to a dictionary of column lists, keyed by the FastaEntry field names.
 
-        if not line:
-            continue
+    Unlike fasta_to_entries, no intermediate FastaEntry objects are created, which makes this the preferred path
+    when the goal is a DataFrame.
 
-        if line.startswith(">"):  # new protein
-            if current_entry is not None:
-                yield current_entry
-                current_entry = None
+    :param data: FASTA content or a file-like object containing FASTA content.
+    :type data: Union[str, TextIOWrapper, StringIO, TextIO]
+    :param skip_error: If True, skips invalid FASTA entries instead of raising an error.
+    :type skip_error: bool
+    :param headers_only: If True, the sequences are skipped and the protein_sequence column is omitted.
+    :type headers_only: bool
+
+    :return: A dictionary mapping each column name to the list of its values.
+    :rtype: Dict[str, List[str]]
+    """
+
+    return _records_to_columns(_fasta_to_records(data, skip_error, headers_only), _get_cols(headers_only))
+
+
+def _get_cols(headers_only: bool) -> List[str]:
+    """
+    Returns the column names produced by the parser.
+
+    :param headers_only: Whether the sequences are skipped.
+    :type headers_only: bool
+    :return: COLS, without protein_sequence if headers_only is True.
+    :rtype: List[str]
+    """
+
+    return COLS[:-1] if headers_only else COLS
+
+
+def _records_to_columns(records: Iterable[Tuple[str, ...]], cols: List[str]) -> Dict[str, List[str]]:
+    """
+    Transposes record tuples into a dictionary of column lists.
+
+    :param records: The record tuples.
+    :type records: Iterable[Tuple[str, ...]]
+    :param cols: The column names, in the same order as the values of each record.
+    :type cols: List[str]
+    :return: A dictionary mapping each column name to the list of its values.
+    :rtype: Dict[str, List[str]]
+    """
+
+    columns = {col: [] for col in cols}
+    appenders = [columns[col].append for col in cols]
+
+    for record in records:
+        for append, value in zip(appenders, record):
+            append(value)
+
+    return columns
+
+
+def _columns_to_df(columns: Dict[str, List]) -> pd.DataFrame:
+    """
+    Converts a dictionary of column lists (as returned by fasta_to_columns) to a pandas DataFrame.
+
+    :param columns: Dictionary mapping each column name to the list of its values.
+    :type columns: Dict[str, List]
+
+    :return: A pandas DataFrame with each column converted to its best datatype.
+    :rtype: pd.DataFrame
+    """
+
+    # the converted columns are new objects, so the DataFrame can take ownership of them instead of copying
+    fasta_df = pd.DataFrame({col_name: _to_column_values(values) for col_name, values in columns.items()}, copy=False)
+    return fasta_df
+
+
+def _to_column_values(values: List) -> Union[List, np.ndarray]:
+    """
+    Converts the values of a column to their best datatype, as a numpy array if they are numeric.
+
+    pandas infers the dtype of a list of python numbers value by value; building the int64/float64 array up front
+    skips that.
+
+    :param values: The values of a single column.
+    :type values: List
+    :return: The converted values, as an int64/float64 numpy array for numeric columns, otherwise as a list.
+    :rtype: Union[List, np.ndarray]
+    """
+
+    values = convert_to_best_datatype(values)
+
+    if values and isinstance(values[0], (int, float)):  # convert_to_best_datatype gives a single type per column
+        try:
+            return np.array(values, dtype=np.float64 if isinstance(values[0], float) else np.int64)
+        except OverflowError:  # integers beyond int64, leave the dtype to pandas
+            pass
+
+    return values
+
+
+def _looks_numeric(values: List) -> bool:
+    """
+    Cheaply checks whether the first non-null value can be read as a number, to avoid full casts that will fail.
+
+    :param values: The column values.
+    :type values: List
+    :return: True if the first non-null value parses as a float.
+    :rtype: bool
+    """
 
+    sample = next((value for value in values if value is not None), None)
+    try:
+        float(sample)
+    except (ValueError, TypeError):
+        return False
+    return True
+
+
+def _columns_to_arrow_df(columns: Dict[str, List]) -> pd.DataFrame:
+    """
+    Converts a dictionary of column lists to a pandas DataFrame backed by pyarrow arrays.
+
+    Type inference happens in Arrow: the columns in _INTEGER_COLS are cast straight to int32, other string columns that
+    fully parse as integers (or floats) are cast accordingly, and missing values become nulls. The low cardinality
+    columns in _CATEGORICAL_COLS are dictionary encoded and returned as pandas categoricals.
+
+    :param columns: Dictionary mapping each column name to the list of its values.
+    :type columns: Dict[str, List]
+
+    :return: A pandas DataFrame with pd.ArrowDtype columns.
+    :rtype: pd.DataFrame
+    """
+
+    try:
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError("dtype_backend='pyarrow' requires pyarrow, install it with: pip install pyarrow") from e
+
+    arrays = {}
+    for col_name, values in columns.items():
+        array = pa.array(values)
+
+        if col_name in _INTEGER_COLS:
+            cast_types = (pa.int32(), pa.int64(), pa.float64())
+        elif pa.types.is_string(array.type) and _looks_numeric(values):
+            cast_types = (pa.int64(), pa.float64())
+        else:
+            cast_types = ()
+
+        for arrow_type in cast_types:
             try:
-                current_entry = _fasta_str_to_entry(line)
-            except ValueError as e:
-                if skip_error:
-                    current_entry = None
-                    continue
-                raise e
+                array = array.cast(arrow_type)
+                break
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                continue
+        if col_name in _CATEGORICAL_COLS and pa.types.is_string(array.type):
+            array = array.dictionary_encode()
+        arrays[col_name] = array
 
-        elif current_entry:
-            current_entry.protein_sequence += line
+    # dictionary encoded columns are returned as pandas categoricals, which support far more operations
+    return pa.table(arrays).to_pandas(
+        types_mapper=lambda arrow_type: None if pa.types.is_dictionary(arrow_type) else pd.ArrowDtype(arrow_type))
 
-    if current_entry:
-        yield current_entry
 
+def _build_df(columns: Dict[str, List], dtype_backend: str = None) -> pd.DataFrame:
+    """
+    Converts a dictionary of column lists to a pandas DataFrame using the requested dtype backend.
+
+    :param columns: Dictionary mapping each column name to the list of its values.
+    :type columns: Dict[str, List]
+    :param dtype_backend: None for the default numpy backed columns, or 'pyarrow' for pd.ArrowDtype columns.
+    :type dtype_backend: str, optional
+
+    :return: A pandas DataFrame representing the columns.
+    :rtype: pd.DataFrame
+    """
+
+    if dtype_backend is None:
+        return _columns_to_df(columns)
+    if dtype_backend == 'pyarrow':
+        return _columns_to_arrow_df(columns)
+    raise ValueError(f"Unsupported dtype_backend: {dtype_backend}. Expected None or 'pyarrow'")
 
-def entries_to_df(entries: Iterable[FastaEntry]) -> pd.DataFrame:
+
+def entries_to_df(entries: Iterable[FastaEntry], dtype_backend: str = None) -> pd.DataFrame:
     """
     Converts a list of FastaEntry objects to a pandas DataFrame.
 
     :param entries: List of FastaEntry objects.
     :type entries: List[FastaEntry]
+    :param dtype_backend: None for the default numpy backed columns, or 'pyarrow' for pd.ArrowDtype columns.
+    :type dtype_backend: str, optional
 
     :return: A pandas DataFrame representing the FastaEntry objects.
     :rtype: pd.DataFrame
     """
 
-    fasta_df = pd.DataFrame([asdict(entry) for entry in entries])
+    entries = list(entries)  # may be a generator, and each column makes its own pass
+    columns = {col: list(map(attrgetter(col), entries)) for col in COLS}
 
-    for col_name in fasta_df:
-        fasta_df[col_name] = convert_to_best_datatype(fasta_df[col_name])
-    return fasta_df
+    return _build_df(columns, dtype_backend)
 
 
-def to_df(data: Union[str, TextIOWrapper, StringIO, TextIO, List[FastaEntry]], skip_error: bool = False) -> pd.DataFrame:
+def to_df(data: Union[str, TextIOWrapper, StringIO, TextIO, List[FastaEntry]], skip_error: bool = False,
+          dtype_backend: str = None, headers_only: bool = False) -> pd.DataFrame:
     """
     Converts a FASTA input or list of FastaEntry objects to a pandas DataFrame.
 
@@ -167,20 +492,72 @@ def to_df(data: Union[str, TextIOWrapper, StringIO, TextIO, List[FastaEntry]], s
     :type data: Union[str, TextIOWrapper, StringIO, TextIO, List[FastaEntry]]
     :param skip_error: If True, skips invalid FASTA entries instead of raising an error.
     :type skip_error: bool
+    :param dtype_backend: None for the default numpy backed columns, or 'pyarrow' for pd.ArrowDtype columns, which
+        store strings far more compactly and represent missing values as nulls. With 'pyarrow' the db and
+        organism_name columns are categoricals. Requires pyarrow.
+    :type dtype_backend: str, optional
+    :param headers_only: If True, the sequences are skipped and the protein_sequence column is omitted, which is
+        considerably faster when only the header information is needed. Ignored for a list of FastaEntry objects.
+    :type headers_only: bool
 
     :return: A pandas DataFrame representing the FASTA content or FastaEntry objects.
     :rtype: pd.DataFrame
     """
 
     if isinstance(data, list):
-        return entries_to_df(data)
+        return entries_to_df(data, dtype_backend)
+
+    return _build_df(fasta_to_columns(data, skip_error, headers_only), dtype_backend)
 
-    return entries_to_df(fasta_to_entries(data, skip_error))
+
+def to_df_chunks(data: Union[str, TextIOWrapper, StringIO, TextIO], chunk_size: int = 100_000,
+                 skip_error: bool = False, dtype_backend: str = None,
+                 headers_only: bool = False) -> Generator[pd.DataFrame, None, None]:
+    """
+    Converts a FASTA input to a sequence of pandas DataFrames of at most chunk_size entries each.
+
+    Only one chunk is held in memory at a time, so FASTA files larger than memory can be processed (for example by
+    appending each chunk to a csv file). The index continues across chunks, so concatenating all chunks gives the same
+    rows as to_df. Since datatypes are chosen per chunk, a column may get a different dtype in different chunks.
+
+    :param data: FASTA content or a file-like object containing FASTA content.
+    :type data: Union[str, TextIOWrapper, StringIO, TextIO]
+    :param chunk_size: The maximum number of entries per DataFrame.
+    :type chunk_size: int
+    :param skip_error: If True, skips invalid FASTA entries instead of raising an error.
+    :type skip_error: bool
+    :param dtype_backend: None for the default numpy backed columns, or 'pyarrow' for pd.ArrowDtype columns.
+    :type dtype_backend: str, optional
+    :param headers_only: If True, the sequences are skipped and the protein_sequence column is omitted.
+    :type headers_only: bool
+
+    :return: A generator that yields pandas DataFrames.
+    :rtype: Generator[pd.DataFrame, None, None]
+    """
+
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got: {chunk_size}")
+
+    records = _fasta_to_records(data, skip_error, headers_only)
+    cols = _get_cols(headers_only)
+    start = 0
+
+    while True:
+        columns = _records_to_columns(islice(records, chunk_size), cols)
+        num_entries = len(columns['db'])
+        if num_entries == 0:
+            break
+
+        fasta_df = _build_df(columns, dtype_backend)
+        fasta_df.index = pd.RangeIndex(start, start + num_entries)
+        start += num_entries
+
+        yield fasta_df
 
 
 def df_to_entries(df: pd.DataFrame) -> List[FastaEntry]:
     """
-    Converts a fasta dataframe to a list of FastaEntry objects.
+    Converts a fasta dataframe to a list of FastaEntry objects. Missing values are converted to None.
 
     :param df: The fasta dataframe.
     :type df: pd.DataFrame
@@ -189,83 +566,182 @@ def df_to_entries(df: pd.DataFrame) -> List[FastaEntry]:
     :rtype: List[FastaEntry]
     """
 
-    entries = [FastaEntry(**row.to_dict()) for _, row in df[COLS].iterrows()]
+    columns = []
+    for col in COLS:
+        values = df[col]
+        if values.hasnans:  # missing values become None rather than nan
+            values = values.astype(object).where(values.notna(), None)
+        columns.append(values.tolist())
+
+    entries = list(map(FastaEntry, *columns))
     return entries
 
 
-def entries_to_fasta(entries: Iterable[FastaEntry], output_file: str = None) -> Union[StringIO, None]:
+def entries_to_fasta(entries: Iterable[FastaEntry], output_file: Union[str, os.PathLike, TextIO] = None) \
+        -> Union[StringIO, None]:
     """
     Converts a list of FastaEntry objects to a StringIO object or file containing the fasta content.
 
     :param entries: The list containing FastaEntry objects.
     :type entries: Iterable[FastaEntry]
-    :param output_file: The path to the output file. If None, the function will return a StringIO.
-    :type output_file: str, optional
+    :param output_file: The path to the output file, or an open text stream to write to. If None, the function will
+        return a StringIO.
+    :type output_file: Union[str, os.PathLike, TextIO], optional
 
     :return: A StringIO object containing the fasta content or None if an output file is provided.
     :rtype: Union[StringIO, None]
     """
 
-    fasta_string = StringIO()
-    for entry in entries:
-        fasta_string.write(entry.serialize())
-
-    fasta_string.seek(0)
+    records = map(FastaEntry.serialize, entries)
 
     if output_file is not None:
-        with open(file=output_file, mode='w', encoding='UTF-8') as f:
-            f.write(fasta_string.getvalue())
+        # write straight to the output instead of building the whole content in memory first
+        _write_records(records, output_file)
         return None
 
+    fasta_string = StringIO()
+    fasta_string.writelines(records)
+
+    fasta_string.seek(0)
     return fasta_string
 
 
-def to_fasta(data: Union[pd.DataFrame, Iterable[FastaEntry]], output_file: str = None) -> Union[StringIO, None]:
+def to_fasta(data: Union[pd.DataFrame, Iterable[FastaEntry]], output_file: Union[str, os.PathLike, TextIO] = None) \
+        -> Union[StringIO, None]:
     """
     Converts a fasta dataframe or list of FastaEntries to a StringIO object or file containing the fasta content.
 
     :param data: The fasta dataframe or a list of FastaEntry objects.
     :type data: Union[pd.DataFrame, Iterable[FastaEntry]]
-    :param output_file: The path to the output file. If None, the function will return a StringIO.
-    :type output_file: str, optional
+    :param output_file: The path to the output file, or an open text stream to write to. If None, the function will
+        return a StringIO.
+    :type output_file: Union[str, os.PathLike, TextIO], optional
     :return: A StringIO object containing the fasta content or None if an output file is provided.
     :rtype: Union[StringIO, None]
     """
 
     if isinstance(data, pd.DataFrame):
-        return entries_to_fasta(df_to_entries(data), output_file)
+        records = _df_to_fasta_records(data)
+
+        if output_file is not None:
+            _write_records(records, output_file)
+            return None
+
+        return StringIO(''.join(records))
 
     return entries_to_fasta(data, output_file)
 
 
-def _extract_fasta_header_elements(entry_str: str) -> List[str]:
+def _write_records(records: Iterable[str], output_file: Union[str, os.PathLike, TextIO]) -> None:
     """
-    Extracts the elements from the header line of a fasta entry.
+    Writes serialized fasta records to a file path, or to an open text stream which is left open.
 
-    :param entry_str: The header line of a fasta entry.
-    :type entry_str: str
-    :return: List of elements extracted from the header line.
+    :param records: The serialized fasta records.
+    :type records: Iterable[str]
+    :param output_file: The path to the output file, or an open text stream to write to.
+    :type output_file: Union[str, os.PathLike, TextIO]
+    """
+
+    if isinstance(output_file, (str, os.PathLike)):
+        with open(file=output_file, mode='w', encoding='UTF-8', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.writelines(records)
+    else:
+        output_file.writelines(records)
+
+
+def _df_to_fasta_records(df: pd.DataFrame) -> List[str]:
+    """
+    Serializes a fasta dataframe to FASTA records.
+
+    Optional fields are omitted from the header when they are missing or falsy (e.g. '' or 0), like FastaEntry.serialize
+    does, but without creating a FastaEntry per row. Unlike serialize, a missing value in any column is treated as ''
+    rather than written as 'None' or 'nan'. Optional columns without any omitted values are formatted by
+    _record_formatter unconditionally, the others are rendered up front as ' XX=value' or ''.
+
+    :param df: The fasta dataframe.
+    :type df: pd.DataFrame
+    :return: The FASTA text of each row.
     :rtype: List[str]
     """
 
-    line_elements = entry_str.rstrip().replace('>', '').split(" ")
-    return line_elements
+    def _values(col_name: str) -> List:
+        values = df[col_name]
+        if values.hasnans:  # missing values become '', for any dtype (fillna('') fails on e.g. int32[pyarrow])
+            values = values.astype(object).where(values.notna(), '')
+        return values.tolist()
+
+    columns = [_values('db'), _values('unique_identifier'), _values('entry_name')]
+    prefixes = []
+
+    for col_name, key in _OPTIONAL_KEYS:
+        values = _values(col_name)
+
+        if not all(values):
+            columns.append([f'{key}{value}' if value else '' for value in values])
+            prefixes.append('')
+        else:
+            columns.append(values)
+            prefixes.append(key)
+
+    columns.append(_values('protein_sequence'))
+
+    return list(map(_record_formatter(tuple(prefixes)), *columns))
+
+
+@lru_cache(maxsize=None)
+def _record_formatter(prefixes: Tuple[str, ...]) -> Callable[..., str]:
+    """
+    Generates a function that formats a FASTA record from its column values with a single f-string.
+
+    Generating the f-string for the columns at hand avoids a conditional per optional field and row, which a fixed
+    formatting function would need. There are at most 2^6 variants, so each is generated once.
+
+    :param prefixes: The ' XX=' key written before each optional field (in _OPTIONAL_KEYS order), or '' for fields whose
+        values already include their key.
+    :type prefixes: Tuple[str, ...]
+    :return: A function taking the values of the COLS columns, in order, and returning the FASTA record.
+    :rtype: Callable[..., str]
+    """
+
+    fields = ''.join(f'{prefix}{{{col_name}}}' for (col_name, _), prefix in zip(_OPTIONAL_KEYS, prefixes))
+    template = f'>{{db}}|{{unique_identifier}}|{{entry_name}}{fields}\\n{{protein_sequence}}\\n'
+
+    namespace = {}
+    exec(f"def _format_record({', '.join(COLS)}):\n    return f'{template}'\n", namespace)  # pylint: disable=exec-used
+    return namespace['_format_record']
 
 
-def _extract_initial_info(line_elements: List[str]) -> Tuple[str, str, str]:
+def _extract_fasta_header_elements(entry_str: str) -> Tuple[str, str]:
+    """
+    Splits the header line of a fasta entry into its >db|UniqueIdentifier|EntryName part and its description.
+
+    :param entry_str: The header line of a fasta entry, with or without its leading '>'.
+    :type entry_str: str
+    :return: Tuple containing the identifier part and the (possibly empty) description.
+    :rtype: Tuple[str, str]
     """
-    Extracts the initial information, such as database, unique identifier, and entry name from the list of elements.
 
-    :param line_elements: List of elements extracted from the header line of a fasta entry.
-    :type line_elements: List[str]
+    if entry_str.startswith('>'):
+        entry_str = entry_str[1:]
+
+    identifier, _, description = entry_str.rstrip().partition(' ')
+    return identifier, description
+
+
+def _extract_initial_info(identifier: str) -> Tuple[str, str, str]:
+    """
+    Extracts the initial information, such as database, unique identifier, and entry name from the identifier part.
+
+    :param identifier: The >db|UniqueIdentifier|EntryName part of the header line of a fasta entry.
+    :type identifier: str
     :return: Tuple containing database, unique identifier, and entry name.
     :rtype: Tuple[str, str, str]
     """
 
-    first_element_parts = line_elements[0].split('|')
+    first_element_parts = identifier.split('|')
 
     if len(first_element_parts) != 3:
-        raise ValueError(f"The provided header: {line_elements[0]} does not match the expected format of:"
+        raise ValueError(f"The provided header: {identifier} does not match the expected format of:"
                          f" >db|UniqueIdentifier|EntryName")
 
     db = first_element_parts[0]
@@ -275,33 +751,72 @@ def _extract_initial_info(line_elements: List[str]) -> Tuple[str, str, str]:
     return db, unique_identifier, entry_name
 
 
-def _process_line_elements(line_elements: List[str]) -> Dict[str, List[str]]:
+def _process_description(description: str) -> Dict[str, str]:
     """
-    Processes the list of line elements and groups them into a dictionary.
+    Groups the description of a fasta header by field key.
 
-    The first element is ignored since this only contains the >db|UniqueIdentifier|EntryName string. After this, the
-    next expected element is ProteinName which is not specified by the XX= notation. The remaining components will be
-    specified by the XX= notation, and can be parsed accordingly.
+    The description starts with the ProteinName, which is not specified by the XX= notation. The remaining components
+    are specified by the XX= notation. In well formed UniProt headers each of them appears at most once and the
+    description holds no other '=', so the values are sliced out between the positions of their ' XX=' markers.
+    Any other description is handled by _split_description.
 
-    :param line_elements: List of elements extracted from the header line of a fasta entry.
-    :type line_elements: List[str]
-    :return: Dictionary containing grouped elements.
-    :rtype: Dict[str, List[str]]
+    :param description: The part of the header line following >db|UniqueIdentifier|EntryName.
+    :type description: str
+    :return: Dictionary mapping field keys to their values.
+    :rtype: Dict[str, str]
     """
 
+    found = []
+    for key, marker in _DESCRIPTION_MARKERS:
+        position = description.find(marker)
+        if position != -1:
+            found.append((position, key, position + len(marker)))
+
+    # an '=' that is not part of a found marker means a repeated, unknown or PN= key, or an '=' inside a value
+    if len(found) != description.count('='):
+        return _split_description(description)
+
+    found.sort()
+
     info = {}
-    current_state = FastaFields.PROTEIN_NAME.value
+    end = len(description)
+    for position, key, value_start in reversed(found):
+        info[key] = description[value_start:end]
+        end = position
 
-    for elem in line_elements[1:]:
+    if end:
+        info['PN'] = description[:end]
+
+    return info
 
-        if '=' in elem:
-            current_state = elem[:2]  # Assuming that the field keys are always two characters long
-            elem = elem[3:]
 
-        if current_state not in {field.value for field in FastaFields}:
-            raise ValueError(f"Unexpected element: {current_state} encountered. Line: {line_elements}")
+def _split_description(description: str) -> Dict[str, str]:
+    """
+    Groups the description of a fasta header by field key, allowing any XX= key in any order.
 
-        info.setdefault(current_state, []).append(elem)
+    A single split with _FIELD_KEY_PATTERN yields the ProteinName followed by alternating keys and values. Every space
+    separated token containing '=' is treated as a key, and keys that appear more than once have their values joined by
+    a space.
+
+    :param description: The part of the header line following >db|UniqueIdentifier|EntryName.
+    :type description: str
+    :return: Dictionary mapping field keys to their values.
+    :rtype: Dict[str, str]
+    :raises ValueError: If the description contains a key that is not one of FastaFields.
+    """
+
+    parts = _FIELD_KEY_PATTERN.split(description)
+
+    info = {'PN': parts[0]} if parts[0] else {}
+
+    for key, value in zip(parts[1::2], parts[2::2]):
+        if key not in _VALID_FIELDS:
+            raise ValueError(f"Unexpected element: {key} encountered. Line: {description}")
+
+        if key in info:
+            info[key] += ' ' + value
+        else:
+            info[key] = value
 
     return info
 
@@ -316,23 +831,38 @@ def _fasta_str_to_entry(fasta_str: str) -> FastaEntry:
     :rtype: FastaEntry
     """
 
-    line_elements = _extract_fasta_header_elements(fasta_str)
-    db, unique_identifier, entry_name = _extract_initial_info(line_elements)
-    info = _process_line_elements(line_elements)
+    return FastaEntry(*_parse_fasta_header(fasta_str))
 
-    def _join_list_values(data: Dict[str, List[str]]) -> Dict[str, str]:
-        return {k: ' '.join(v) if v else None for k, v in data.items()}
 
-    joined_info = _join_list_values(info)
+def _parse_fasta_header(fasta_str: str) -> Tuple[str, ...]:
+    """
+    Extracts fasta information from the given fasta str, ordered like the FastaEntry header fields.
+
+    :param fasta_str: The header line of a fasta entry.
+    :type fasta_str: str
+    :return: Tuple of db, unique_identifier, entry_name, protein_name, organism_name, organism_identifier,
+        gene_name, protein_existence and sequence_version.
+    :rtype: Tuple[str, ...]
+    """
 
-    return FastaEntry(
-        db=db,
-        unique_identifier=unique_identifier,
-        entry_name=entry_name,
-        protein_name=joined_info.get('PN'),
-        organism_name=joined_info.get('OS'),
-        organism_identifier=joined_info.get('OX'),
-        gene_name=joined_info.get('GN'),
-        protein_existence=joined_info.get('PE'),
-        sequence_version=joined_info.get('SV')
+    identifier, description = _extract_fasta_header_elements(fasta_str)
+    db, unique_identifier, entry_name = _extract_initial_info(identifier)
+    info = _process_description(description)
+
+    # db and organism_name repeat across most entries of a file, interning keeps one str per distinct value instead of
+    # one per entry (PE and SV are mostly single characters, which python shares already)
+    organism_name = info.get('OS')
+    if organism_name is not None:
+        organism_name = sys.intern(organism_name)
+
+    return (
+        sys.intern(db),
+        unique_identifier,
+        entry_name,
+        info.get('PN'),
+        organism_name,
+        info.get('OX'),
+        info.get('GN'),
+        info.get('PE'),
+        info.get('SV')
     )
@@ -2,29 +2,93 @@
 This module provides some simple utility functions for filterframes
 """
 
+import codecs
 import os
-from io import TextIOWrapper, StringIO
-from typing import Union, List, TextIO, Any, Generator
+from io import TextIOWrapper, StringIO, BufferedIOBase, BufferedReader, BytesIO
+from itertools import chain
+from typing import Union, List, TextIO, BinaryIO, Any, Generator, Iterable, Dict, Callable
+
+DEFAULT_BLOCK_SIZE = 1 << 22  # 4 MiB of text per block
 
 
 def read_lines_from_text_io(file_input: TextIO) -> Generator[str, None, None]:
     """Read lines from a TextIO object."""
     file_input.seek(0)
     for line in file_input:
-        yield line.rstrip('\n')
+        yield line.rstrip('\r\n')
 
 
 def read_lines_from_file(file_path: str) -> Generator[str, None, None]:
     """Read lines from a file."""
     with open(file=file_path, mode='r', encoding='UTF-8') as file:
         for line in file:
-            yield line.rstrip('\n')
+            yield line.rstrip('\r\n')
 
 
 def read_lines_from_string(s: str) -> Generator[str, None, None]:
     """Read lines from a string."""
-    for line in s.split('\n'):
-        yield line.rstrip('\n')
+    # slice one line at a time rather than splitting (or wrapping in a StringIO) which would copy the whole string
+    start = 0
+    end = s.find('\n')
+    while end != -1:
+        yield s[start:end].rstrip('\r')
+        start = end + 1
+        end = s.find('\n', start)
+
+    if start < len(s):
+        yield s[start:].rstrip('\r')
+
+
+def read_lines_from_iterable(lines: Iterable[Union[str, bytes]]) -> Generator[str, None, None]:
+    """Read lines from an iterable of str lines, or of UTF-8 encoded bytes lines."""
+    lines = iter(lines)
+    first_line = next(lines, None)
+    if first_line is None:
+        return
+
+    # the type of the first line decides for all of them, rather than checking every line
+    if isinstance(first_line, bytes):
+        for line in chain([first_line], lines):
+            yield line.decode('UTF-8').rstrip('\r\n')
+    else:
+        for line in chain([first_line], lines):
+            yield line.rstrip('\r\n')
+
+
+def is_file_path(s: str) -> bool:
+    """Check whether a string is the path of an existing file, rather than file content."""
+    # file content spans multiple lines, and os.path.exists would encode the whole string just to reject it
+    return '\n' not in s and os.path.exists(s)
+
+
+def read_lines_from_path_or_string(s: str) -> Generator[str, None, None]:
+    """Read lines from a file path, or from the string itself if it is not an existing file."""
+    if is_file_path(s):
+        yield from read_lines_from_file(s)
+    else:
+        yield from read_lines_from_string(s)
+
+
+# readers keyed by input type, checked with a single dict lookup before falling back to isinstance
+_LINE_READERS = {
+    str: read_lines_from_path_or_string,
+    TextIOWrapper: read_lines_from_text_io,
+    TextIO: read_lines_from_text_io,
+    StringIO: read_lines_from_text_io,
+}
+
+
+def _find_reader(readers: Dict[type, Callable], file_input: Any, default: Callable) -> Callable:
+    """Find the reader for the type of file_input, including subclasses of the supported types."""
+    reader = readers.get(type(file_input))
+    if reader is not None:
+        return reader
+
+    for input_type, reader in readers.items():
+        if isinstance(file_input, input_type):
+            return reader
+
+    return default
 
 
 def get_lines(file_input: Union[str, TextIOWrapper, StringIO, TextIO]) -> Generator[str, None, None]:
@@ -39,23 +103,100 @@ def get_lines(file_input: Union[str, TextIOWrapper, StringIO, TextIO]) -> Genera
 
     Returns:
         generator: A generator that yields lines from the input source.
-
-    Raises:
-        ValueError: If the input type is not supported.
     """
-    if isinstance(file_input, str):
-        if os.path.exists(file_input):
-            yield from read_lines_from_file(file_input)
-        else:
-            yield from read_lines_from_string(file_input)
-    elif isinstance(file_input, (TextIOWrapper, TextIO, StringIO)):
-        yield from read_lines_from_text_io(file_input)
+    reader = _find_reader(_LINE_READERS, file_input, read_lines_from_iterable)
+    yield from reader(file_input)
+
+
+def read_blocks_from_text_io(file_input: TextIO, block_size: int) -> Generator[str, None, None]:
+    """Read blocks of up to block_size characters from a TextIO object."""
+    file_input.seek(0)
+    while True:
+        block = file_input.read(block_size)
+        if not block:
+            break
+        yield block
+
+
+def read_blocks_from_file(file_path: str, block_size: int) -> Generator[str, None, None]:
+    """Read blocks of up to block_size characters from a file."""
+    with open(file=file_path, mode='r', encoding='UTF-8') as file:
+        yield from read_blocks_from_text_io(file, block_size)
+
+
+def read_blocks_from_lines(lines: Iterable[str], block_size: int) -> Generator[str, None, None]:
+    """Join lines (without their trailing newline) into newline terminated blocks of roughly block_size characters."""
+    block, size = [], 0
+    for line in lines:
+        block.append(line)
+        size += len(line) + 1
+        if size >= block_size:
+            block.append('')
+            yield '\n'.join(block)
+            block, size = [], 0
+    if block:
+        block.append('')
+        yield '\n'.join(block)
+
+
+def read_blocks_from_path_or_string(s: str, block_size: int) -> Generator[str, None, None]:
+    """Read blocks from a file path, or yield the string itself if it is not an existing file."""
+    if is_file_path(s):
+        yield from read_blocks_from_file(s, block_size)
     else:
-        for line in file_input:
-            if isinstance(line, bytes):
-                yield line.decode('UTF-8').rstrip('\n')
-            else:
-                yield line.rstrip('\n')
+        yield s
+
+
+def read_blocks_from_iterable(lines: Iterable[Union[str, bytes]], block_size: int) -> Generator[str, None, None]:
+    """Read blocks from an iterable of str or UTF-8 encoded bytes lines."""
+    yield from read_blocks_from_lines(read_lines_from_iterable(lines), block_size)
+
+
+def read_blocks_from_binary_io(file_input: BinaryIO, block_size: int) -> Generator[str, None, None]:
+    """Read blocks of up to block_size bytes from a binary file object (e.g. a streamlit upload) and decode them."""
+    decoder = codecs.getincrementaldecoder('UTF-8')()  # a character can be split across two blocks
+    while True:
+        chunk = file_input.read(block_size)
+        if not chunk:
+            break
+        block = decoder.decode(chunk)
+        if block:
+            yield block
+
+    block = decoder.decode(b'', final=True)
+    if block:
+        yield block
+
+
+_BLOCK_READERS = {
+    str: read_blocks_from_path_or_string,
+    TextIOWrapper: read_blocks_from_text_io,
+    TextIO: read_blocks_from_text_io,
+    StringIO: read_blocks_from_text_io,
+    BytesIO: read_blocks_from_binary_io,
+    BufferedReader: read_blocks_from_binary_io,
+    BufferedIOBase: read_blocks_from_binary_io,
+}
+
+
+def get_blocks(file_input: Union[str, TextIOWrapper, StringIO, TextIO],
+               block_size: int = DEFAULT_BLOCK_SIZE) -> Generator[str, None, None]:
+    """
+    Retrieve large blocks of text from a file or string input.
+
+    Accepts the same inputs as get_lines, but yields the raw text (newlines included) in blocks of roughly
+    block_size characters, so that callers can process it with bulk string operations instead of line by line.
+    Blocks are not aligned to line boundaries.
+
+    Args:
+        file_input (Union[str, TextIOWrapper, StringIO, TextIO]): The input source.
+        block_size (int): The approximate number of characters per block.
+
+    Returns:
+        generator: A generator that yields blocks of text from the input source.
+    """
+    reader = _find_reader(_BLOCK_READERS, file_input, read_blocks_from_iterable)
+    yield from reader(file_input, block_size)
 
 
 def best_datatype_for_list(values: List[Any]) -> Union[type, None]:
@@ -90,9 +231,11 @@ def convert_to_best_datatype(values: List[Any]) -> List[Any]:
     Raises:
         ValueError: If unable to convert values to any datatype.
     """
-    best_datatype = best_datatype_for_list(values)
-
-    if best_datatype is None:
-        raise ValueError("Unable to convert values to any datatype")
+    # keep the first conversion that succeeds for every value rather than probing for the type and converting again
+    for datatype in [int, float, str]:
+        try:
+            return list(map(datatype, values))
+        except (ValueError, TypeError):
+            continue
 
-    return [best_datatype(value) for value in values]
+    raise ValueError("Unable to convert values to any datatype")
@@ -127,6 +127,30 @@ from fastaframes.fastaframes import _fasta_str_to_entry
         'protein_existence': '4',
         'sequence_version': None,
         'protein_sequence': '',
+    }),
+    (">sp|P0DTC2|SPIKE_SARS2 Spike glycoprotein (S protein->S1) OS=SARS-CoV-2 OX=2697049 PE=1 SV=1", {
+        'db': 'sp',
+        'unique_identifier': 'P0DTC2',
+        'entry_name': 'SPIKE_SARS2',
+        'protein_name': 'Spike glycoprotein (S protein->S1)',  # only the leading '>' is removed
+        'organism_name': 'SARS-CoV-2',
+        'organism_identifier': '2697049',
+        'gene_name': None,
+        'protein_existence': '1',
+        'sequence_version': '1',
+        'protein_sequence': '',
+    }),
+    (">sp|A0A087X1C5|CP2D7_HUMAN PN=Putative cytochrome P450 2D7 OS=Homo sapiens OX=9606 PE=1 SV=1", {  # explicit PN=
+        'db': 'sp',
+        'unique_identifier': 'A0A087X1C5',
+        'entry_name': 'CP2D7_HUMAN',
+        'protein_name': 'Putative cytochrome P450 2D7',
+        'organism_name': 'Homo sapiens',
+        'organism_identifier': '9606',
+        'gene_name': None,
+        'protein_existence': '1',
+        'sequence_version': '1',
+        'protein_sequence': '',
     })
 
     # Add more test cases if needed
@@ -134,3 +158,13 @@ from fastaframes.fastaframes import _fasta_str_to_entry
 def test_extract_fasta_info(fasta_entry, expected):
     result = asdict(_fasta_str_to_entry(fasta_entry))
     assert result == expected
+
+
+@pytest.mark.parametrize("fasta_entry", [
+    ">sp|Q9XYZ1|TEST_HUMAN Protein a=b OS=Homo sapiens OX=9606 PE=1 SV=1",
+    ">sp|Q9XYZ1|TEST_HUMAN Protein OS=Homo sapiens XYZ=1 PE=1 SV=1",
+    ">sp|Q9XYZ1|TEST_HUMAN Protein OS=Homo sapiens OC=Eukaryota",
+])
+def test_extract_fasta_info_unknown_key(fasta_entry):
+    with pytest.raises(ValueError):
+        _fasta_str_to_entry(fasta_entry)
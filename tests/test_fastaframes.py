@@ -1,10 +1,13 @@
-from dataclasses import asdict
-from io import StringIO, TextIOWrapper
+import pickle
+import sys
+from dataclasses import asdict, fields
+from io import StringIO, TextIOWrapper, BytesIO
 
 import pandas as pd
+import pytest
 
-from fastaframes import fasta_to_entries, FastaEntry, to_df, df_to_entries, to_fasta
-from fastaframes.util import convert_to_best_datatype, get_lines
+from fastaframes import fasta_to_entries, FastaEntry, to_df, df_to_entries, to_fasta, fasta_to_columns, to_df_chunks
+from fastaframes.util import convert_to_best_datatype, get_lines, get_blocks
 
 
 def tests_input_formats():
@@ -43,6 +46,57 @@ def tests_input_formats():
 
     assert lines1 == lines2 == lines3 == lines4 == lines5 == lines6
 
+    # a trailing newline does not produce an extra empty line, same as when reading a file
+    assert list(get_lines(text_str + '\n')) == lines1
+
+    # windows line endings are stripped for every input type, not just when reading a file in text mode
+    crlf_str = text_str.replace('\n', '\r\n')
+    assert list(get_lines(crlf_str)) == list(get_lines(StringIO(crlf_str))) == lines1
+    assert list(get_lines(line.encode() for line in StringIO(crlf_str, newline=''))) == lines1
+
+
+def test_convert_to_best_datatype():
+    assert convert_to_best_datatype(['1', '2']) == [1, 2]
+    assert convert_to_best_datatype(['1', '2.5']) == [1.0, 2.5]
+    assert convert_to_best_datatype(['1', 'a', None]) == ['1', 'a', 'None']
+
+    # numeric columns give the same result as their python values
+    result = convert_to_best_datatype(pd.Series([1, 2], dtype='uint8'))
+    assert result == [1, 2] and all(type(value) is int for value in result)
+    assert convert_to_best_datatype(pd.Series([1.5, 2.0])) == [1, 2]
+
+
+def test_get_blocks():
+    with open('tests/data/test.fasta') as f:
+        text_str = f.read()
+
+    assert ''.join(get_blocks('tests/data/test.fasta', block_size=7)) == text_str
+    assert ''.join(get_blocks(StringIO(text_str), block_size=7)) == text_str
+    assert ''.join(get_blocks(text_str)) == text_str
+    with open('tests/data/test.fasta') as f:
+        assert ''.join(get_blocks((line.encode() for line in f), block_size=7)) == text_str + '\n'
+
+    # binary streams are decoded per block, including characters split across blocks
+    assert ''.join(get_blocks(BytesIO(text_str.encode()), block_size=7)) == text_str
+    assert ''.join(get_blocks(BytesIO('>sp|A|B Protéine\nAC\n'.encode()), block_size=1)) == '>sp|A|B Protéine\nAC\n'
+
+
+def test_fasta_to_entries_crlf_and_preamble():
+    with open('tests/data/test.fasta') as f:
+        text_str = f.read()
+
+    expected = list(fasta_to_entries(text_str))
+    assert list(fasta_to_entries('\r\n' + text_str.replace('\n', '\r\n'))) == expected
+    assert list(fasta_to_entries('not a fasta entry\n' + text_str)) == expected
+
+
+def test_fasta_to_entries_indented_headers():
+    entries = list(fasta_to_entries('MK\n>sp|A|B\nMK\n  >sp|C|D\nAA\n\t>sp|E|F\nGG'))
+    assert [(e.unique_identifier, e.protein_sequence) for e in entries] == [('A', 'MK'), ('C', 'AA'), ('E', 'GG')]
+
+    entries = list(fasta_to_entries('not a fasta entry\n  >sp|A|B\nMK'))
+    assert [(e.unique_identifier, e.protein_sequence) for e in entries] == [('A', 'MK')]
+
 
 def test_fasta_to_entries():
     fasta_content = \
@@ -86,6 +140,17 @@ def test_fasta_to_entries_no_newlines():
     assert result == expected
 
 
+def test_fasta_to_columns():
+    with open('tests/data/test.fasta', 'r') as file_input:
+        entries = list(fasta_to_entries(file_input))
+
+    with open('tests/data/test.fasta', 'r') as file_input:
+        columns = fasta_to_columns(file_input)
+
+    assert list(columns) == [field.name for field in fields(FastaEntry)]
+    assert [FastaEntry(*values) for values in zip(*columns.values())] == entries
+
+
 def test_from_fasta():
     fasta_content = \
         '>sp|A0A087X1C5|CP2D7_HUMAN Putative cytochrome P450 2D7 OS=Homo sapiens OX=9606 GN=CYP2D7 PE=5 SV=1' \
@@ -111,6 +176,58 @@ def test_from_fasta():
     pd.testing.assert_frame_equal(result, expected)
 
 
+def test_headers_only():
+    expected = to_df('tests/data/test.fasta').drop(columns='protein_sequence')
+
+    pd.testing.assert_frame_equal(to_df('tests/data/test.fasta', headers_only=True), expected)
+    pd.testing.assert_frame_equal(pd.concat(to_df_chunks('tests/data/test.fasta', chunk_size=3, headers_only=True)),
+                                  expected)
+    assert all(entry.protein_sequence == '' for entry in fasta_to_entries('tests/data/test.fasta', headers_only=True))
+
+
+def test_to_df_chunks():
+    chunks = list(to_df_chunks('tests/data/test.fasta', chunk_size=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks), to_df('tests/data/test.fasta'))
+    assert not list(to_df_chunks(''))
+
+
+def test_from_fasta_pyarrow():
+    pytest.importorskip('pyarrow')
+
+    result = to_df('tests/data/test.fasta', dtype_backend='pyarrow')
+    expected = to_df('tests/data/test.fasta')
+
+    assert isinstance(result['db'].dtype, pd.CategoricalDtype)
+    assert isinstance(result['organism_name'].dtype, pd.CategoricalDtype)
+    assert isinstance(result['protein_sequence'].dtype, pd.ArrowDtype)
+    assert str(result['organism_identifier'].dtype) == 'int32[pyarrow]'
+    pd.testing.assert_frame_equal(result.astype(object), expected.astype(object))
+
+    result = to_df(list(fasta_to_entries('tests/data/test.fasta')), dtype_backend='pyarrow')
+    pd.testing.assert_frame_equal(result.astype(object), expected.astype(object))
+
+    result = to_df('>sp|A|B PE=1\nMK\n>sp|C|D OX=9606\nMK', dtype_backend='pyarrow')
+    assert result['organism_identifier'].isna().tolist() == [True, False]
+    assert str(result['protein_existence'].dtype) == 'int32[pyarrow]'
+
+    # missing values in arrow and categorical columns are omitted when writing
+    assert to_fasta(result).getvalue() == '>sp|A|B PE=1\nMK\n>sp|C|D OX=9606\nMK\n'
+
+    with pytest.raises(ValueError):
+        to_df('tests/data/test.fasta', dtype_backend='numpy')
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots require python 3.10")
+def test_fasta_entry_slots():
+    entry = FastaEntry(db='sp', unique_identifier='A0A087X1C5', entry_name='CP2D7_HUMAN')
+
+    assert not hasattr(entry, '__dict__')
+    assert pickle.loads(pickle.dumps(entry)) == entry
+    assert asdict(entry)['entry_name'] == 'CP2D7_HUMAN'
+
+
 def test_df_to_entries():
     data = {
         'db': ['sp'],
@@ -142,6 +259,27 @@ def test_df_to_entries():
     assert result == expected
 
 
+def test_repeated_values_are_shared():
+    entries = list(fasta_to_entries('tests/data/test.fasta'))
+
+    assert all(entry.db is entries[0].db for entry in entries if entry.db == entries[0].db)
+    assert all(entry.organism_name is entries[0].organism_name for entry in entries
+               if entry.organism_name == entries[0].organism_name)
+
+
+def test_df_to_entries_missing_values():
+    fasta_df = to_df('tests/data/test.fasta')
+    fasta_df.loc[0, 'gene_name'] = None
+    fasta_df['organism_identifier'] = fasta_df['organism_identifier'].astype(float)
+    fasta_df.loc[1, 'organism_identifier'] = float('nan')
+
+    entries = df_to_entries(fasta_df)
+
+    assert entries[0].gene_name is None
+    assert entries[1].organism_identifier is None
+    assert entries[0].serialize() == to_fasta(fasta_df.iloc[:1]).getvalue()
+
+
 def test_to_fasta():
     data = {
         'db': ['sp'],
@@ -163,6 +301,26 @@ def test_to_fasta():
     assert result.getvalue() == expected
 
 
+def test_to_fasta_missing_fields():
+    fasta_df = to_df('tests/data/test.fasta')
+    fasta_df.loc[0, 'gene_name'] = None
+    fasta_df.loc[1, 'protein_name'] = ''
+
+    result = to_fasta(fasta_df).getvalue().split('\n')
+
+    assert result[0] == '>sp|A0A087X1C5|CP2D7_HUMAN PN=Putative cytochrome P450 2D7 OS=Homo sapiens OX=9606 PE=5 SV=1'
+    assert result[2] == '>sp|A0A0B4J2F2|SIK1B_HUMAN OS=Homo sapiens OX=9606 GN=SIK1B PE=5 SV=1'
+    pd.testing.assert_frame_equal(to_df(to_fasta(fasta_df.iloc[2:])), fasta_df.iloc[2:].reset_index(drop=True))
+
+    # falsy values are omitted like FastaEntry.serialize does
+    fasta_df.loc[0, 'protein_existence'] = 0
+    fasta_df['sequence_version'] = fasta_df['sequence_version'].astype(float)
+    fasta_df.loc[0, 'sequence_version'] = 0.0
+    assert to_fasta(fasta_df).getvalue().split('\n')[0] == \
+           '>sp|A0A087X1C5|CP2D7_HUMAN PN=Putative cytochrome P450 2D7 OS=Homo sapiens OX=9606'
+    assert to_fasta(fasta_df).getvalue() == to_fasta(df_to_entries(fasta_df)).getvalue()
+
+
 def test_to_fasta_from_file():
 
     with open('tests/data/test.fasta', 'r') as file_input:
@@ -226,6 +384,27 @@ def test_to_fasta_from_file():
 
     assert result2 == expected
 
+
+def test_to_fasta_output_file(tmp_path):
+    entries = list(fasta_to_entries('tests/data/test.fasta'))
+
+    assert to_fasta(entries, str(tmp_path / 'entries.fasta')) is None
+    assert to_fasta(to_df(entries), str(tmp_path / 'df.fasta')) is None
+
+    expected = to_fasta(entries).getvalue()
+    assert (tmp_path / 'entries.fasta').read_text() == expected
+    assert (tmp_path / 'df.fasta').read_text() == expected
+
+    # an open stream is written to and left open, and path objects work like str paths
+    with open(tmp_path / 'stream.fasta', 'w') as f:
+        assert to_fasta(entries, f) is None
+        assert to_fasta(to_df(entries), f) is None
+    assert (tmp_path / 'stream.fasta').read_text() == expected * 2
+
+    assert to_fasta(entries, tmp_path / 'pathlike.fasta') is None
+    assert (tmp_path / 'pathlike.fasta').read_text() == expected
+
+
 def test_skip_error():
     bad_fasta_content = \
         '>sp|A0A087X1C5||CP2D7_HUMAN Putative cytochrome P450 2D7 OS=Homo sapiens OX=9606 GN=CYP2D7 PE=5 SV=1' \